@@ -0,0 +1,168 @@
+"""
+Measures time-to-first-audio for the text chunking configurations between the
+LLM and TTS using a stand-in LLM and TTS, so chunking can be tuned locally.
+
+Run from the src directory:
+
+    python -m benchmarks.tts_chunking --runs 3
+"""
+import argparse
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from statistics import mean
+from typing import AsyncIterable, Dict, List
+
+from livekit.agents import tokenize
+
+from services.speech_chunker import ChunkerOptions, SpeechChunker
+
+logger = logging.getLogger("tts_chunking")
+
+RESPONSES = [
+    "Sure! The Chinook database has 3,503 tracks, and about 37% of them are rock. "
+    "The top three artists by track count are:\n"
+    "1. **Iron Maiden** with 213 tracks\n"
+    "2. **U2** with 135 tracks\n"
+    "3. **Led Zeppelin** with 114 tracks\n\n"
+    "Would you like me to break that down by album?",
+
+    "Here's a quick summary of today's news: central banks held interest rates steady while markets "
+    "rallied between 1.5–2% on the announcement, and analysts expect at least one more cut before the "
+    "end of the year. Separately, the weather service issued storm warnings for the east coast, "
+    "e.g. Boston and New York, with heavy rain expected overnight.",
+
+    "Good question. Python and JavaScript are both popular, but they shine in different places. Python is "
+    "known for readable syntax and a huge ecosystem for data science, machine learning and automation, so it "
+    "is often the first language people learn. JavaScript runs in every web browser, which makes it the "
+    "default choice for interactive websites, and with Node it also powers a lot of server code. Performance "
+    "depends on the workload; modern JavaScript engines are very fast for typical web tasks, while Python "
+    "leans on native libraries for heavy number crunching. If you want to build websites, start with "
+    "JavaScript. If you are more interested in analyzing data or writing quick scripts, Python is a great "
+    "fit. Honestly, many developers end up learning both, and the concepts you pick up in one carry over "
+    "to the other. Would you like a short learning plan for either of them?",
+]
+
+CONFIGURATIONS: Dict[str, tokenize.SentenceTokenizer] = {
+    "basic sentences": tokenize.basic.SentenceTokenizer(),
+    "chunker": SpeechChunker(),
+    "chunker first=12": SpeechChunker(ChunkerOptions(first_chunk_min_chars=12)),
+    "chunker first=40": SpeechChunker(ChunkerOptions(first_chunk_min_chars=40)),
+    "chunker no growth": SpeechChunker(ChunkerOptions(growth_factor=1.0)),
+    "chunker growth=2.5": SpeechChunker(ChunkerOptions(growth_factor=2.5)),
+    "chunker multilingual": SpeechChunker(ChunkerOptions().for_voice("en-US-AmandaMultilingualNeural")),
+    "shipped (Config.TTS_*)": SpeechChunker(ChunkerOptions.from_config()),
+}
+
+
+@dataclass(frozen=True)
+class StandInTimings:
+    """Latencies used by the stand-in LLM and TTS, in seconds."""
+    llm_first_token: float = 0.35
+    llm_token: float = 0.02
+    tts_first_byte: float = 0.15
+    tts_per_char: float = 0.002
+    speech_chars_per_second: float = 15.0
+
+
+@dataclass
+class RunResult:
+    """Measurements for a single response."""
+    gaps: List[float]
+    chars: int
+
+    @property
+    def first_audio(self) -> float:
+        """The time from the request until the first audio is ready."""
+        return self.gaps[0] if self.gaps else 0.0
+
+    @property
+    def stall(self) -> float:
+        """The silence between chunks after the first audio started playing."""
+        return sum(self.gaps[1:])
+
+
+async def stand_in_llm(response: str, timings: StandInTimings) -> AsyncIterable[str]:
+    """Yield the response one word at a time with LLM-like latency."""
+    await asyncio.sleep(timings.llm_first_token)
+    for token in re.findall(r"\s*\S+", response):
+        yield token
+        await asyncio.sleep(timings.llm_token)
+
+
+async def stand_in_tts(text: str, timings: StandInTimings) -> float:
+    """Synthesize the text with non-streaming TTS latency and return the audio duration."""
+    await asyncio.sleep(timings.tts_first_byte + timings.tts_per_char * len(text))
+    return len(text) / timings.speech_chars_per_second
+
+
+async def measure(tokenizer: tokenize.SentenceTokenizer, response: str, timings: StandInTimings) -> RunResult:
+    """Stream a response through the tokenizer and TTS the way the StreamAdapter does."""
+    stream = tokenizer.stream()
+    start = time.perf_counter()
+
+    async def forward_input() -> None:
+        async for token in stand_in_llm(response, timings):
+            stream.push_text(token)
+        stream.end_input()
+
+    input_task = asyncio.create_task(forward_input())
+    gaps: List[float] = []
+    playback_end = 0.0
+    chars = 0
+    async for ev in stream:
+        duration = await stand_in_tts(ev.token, timings)
+        now = time.perf_counter() - start
+        # Silence before this chunk's audio: the wait for the first audio, then any
+        # time the previous audio finished playing before this chunk was ready
+        gaps.append(max(now - playback_end, 0.0))
+        playback_end = max(playback_end, now) + duration
+        chars += len(ev.token)
+        logger.debug(f"{now:.3f}s: {ev.token!r}")
+
+    await input_task
+    return RunResult(gaps=gaps, chars=chars)
+
+
+async def run(runs: int, timings: StandInTimings) -> None:
+    """Run every configuration against every response and print a summary table."""
+    last_results: Dict[str, List[RunResult]] = {}
+    print(f"{'configuration':<24}{'first audio ms':>16}{'stall ms':>10}{'chunks':>8}{'avg chars':>11}")
+    for name, tokenizer in CONFIGURATIONS.items():
+        results: List[RunResult] = []
+        for _ in range(runs):
+            last_results[name] = [await measure(tokenizer, response, timings) for response in RESPONSES]
+            results.extend(last_results[name])
+
+        chunks = sum(len(r.gaps) for r in results)
+        print(f"{name:<24}"
+              f"{mean(r.first_audio for r in results) * 1000:>16.0f}"
+              f"{mean(r.stall for r in results) * 1000:>10.0f}"
+              f"{chunks / len(results):>8.1f}"
+              f"{sum(r.chars for r in results) / max(chunks, 1):>11.0f}")
+
+    print("\nGap before each chunk's audio in ms, per response (last run):")
+    for name, results in last_results.items():
+        for i, result in enumerate(results):
+            gaps = " ".join(f"{gap * 1000:.0f}" for gap in result.gaps)
+            print(f"{name if i == 0 else '':<24}#{i + 1}: {gaps}")
+
+
+"""Main program"""
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark time-to-first-audio for TTS text chunking")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs per response")
+    parser.add_argument("--llm-token-ms", type=float, default=20, help="stand-in LLM latency per token")
+    parser.add_argument("--tts-first-byte-ms", type=float, default=150, help="stand-in TTS latency per request")
+    parser.add_argument("--tts-per-char-ms", type=float, default=2, help="stand-in TTS latency per character")
+    parser.add_argument("--speech-chars-per-second", type=float, default=15, help="speaking rate of the audio")
+    parser.add_argument("--verbose", action="store_true", help="log every chunk")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    asyncio.run(run(args.runs, StandInTimings(llm_token=args.llm_token_ms / 1000,
+                                              tts_first_byte=args.tts_first_byte_ms / 1000,
+                                              tts_per_char=args.tts_per_char_ms / 1000,
+                                              speech_chars_per_second=args.speech_chars_per_second)))
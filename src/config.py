@@ -5,6 +5,20 @@ import os
 load_dotenv()
 
 
+def parse_token_budgets(value: str) -> dict:
+    """Parse comma separated tool=tokens pairs, e.g. 'search_news=300,execute_code=500'."""
+    budgets = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, budget = item.partition("=")
+        if not name.strip() or not budget.strip().isdigit():
+            raise ValueError(f"Invalid TOOL_RESULT_TOKEN_BUDGETS entry '{item}', expected tool=tokens")
+        budgets[name.strip()] = int(budget)
+    return budgets
+
+
 @dataclass
 class Config:
     AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
@@ -24,5 +38,16 @@ class Config:
     STT_LANGUAGES = ["en-US"]
     TEXT_EMBEDDING_MODEL = os.getenv("TEXT_EMBEDDING_MODEL")
     TTS_VOICE = os.getenv("TTS_VOICE")
+    TTS_FIRST_CHUNK_MIN_CHARS = int(os.getenv("TTS_FIRST_CHUNK_MIN_CHARS", "20"))
+    TTS_MIN_CHUNK_CHARS = int(os.getenv("TTS_MIN_CHUNK_CHARS", "40"))
+    TTS_CHUNK_GROWTH = float(os.getenv("TTS_CHUNK_GROWTH", "1.5"))
+    TTS_MAX_CHUNK_CHARS = int(os.getenv("TTS_MAX_CHUNK_CHARS", "240"))
+    TTS_LOOKAHEAD_CHARS = int(os.getenv("TTS_LOOKAHEAD_CHARS", "8"))
     DEMO_DATABASE = os.getenv("DEMO_DATABASE")
+    CODE_TIMEOUT_SECONDS = float(os.getenv("CODE_TIMEOUT_SECONDS", "30"))
+    CODE_CPU_SECONDS = int(os.getenv("CODE_CPU_SECONDS", "20"))
+    CODE_MEMORY_LIMIT = os.getenv("CODE_MEMORY_LIMIT", "256m")
+    CODE_MAX_OUTPUT_BYTES = int(os.getenv("CODE_MAX_OUTPUT_BYTES", "65536"))
+    TOOL_RESULT_TOKEN_BUDGET = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", "400"))
+    TOOL_RESULT_TOKEN_BUDGETS = parse_token_budgets(os.getenv("TOOL_RESULT_TOKEN_BUDGETS", ""))
 
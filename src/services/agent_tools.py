@@ -4,8 +4,9 @@ from typing import Annotated
 from livekit.agents.llm import FunctionContext, TypeInfo, ai_callable
 
 from config import Config
+from services.result_formatter import ToolResultFormatter
 from tools.bing_search import bing_news_search_impl
-from tools.code_runner import run_code
+from tools.code_runner import COMPLETED, ExecutionLimits, run_code_streaming
 from tools.db_query import DBQuery
 from tools.rag_search import RagSearch
 from tools.weather import get_weather_impl
@@ -23,6 +24,13 @@ class AgentTools(FunctionContext):
         super().__init__()
         self._rag_search = RagSearch.with_azure(Config.AZURE_SEARCH_INDEX_NAME)
         self._db_query = DBQuery.with_azure()
+        self._formatter = ToolResultFormatter(Config.TOOL_RESULT_TOKEN_BUDGET, Config.TOOL_RESULT_TOKEN_BUDGETS)
+        self._execution_limits = ExecutionLimits(
+            timeout_seconds=Config.CODE_TIMEOUT_SECONDS,
+            cpu_seconds=Config.CODE_CPU_SECONDS,
+            memory_limit=Config.CODE_MEMORY_LIMIT,
+            max_output_bytes=Config.CODE_MAX_OUTPUT_BYTES
+        )
 
     @ai_callable(description="Get the current weather for the provided location")
     async def get_weather(
@@ -41,7 +49,8 @@ class AgentTools(FunctionContext):
                 str, TypeInfo(description="The query used to search for current news articles")
             ],
     ) -> str:
-        return await bing_news_search_impl(query)
+        articles = await bing_news_search_impl(query)
+        return self._formatter.format_articles("search_news", query, articles)
 
     @ai_callable(description="Look up information about a specified topic")
     def query_info(
@@ -51,7 +60,7 @@ class AgentTools(FunctionContext):
             ],
     ) -> str:
         result = self._rag_search.query(query)
-        return str(result)
+        return self._formatter.format_response("query_info", result)
 
     @ai_callable(description="Execute code in a sandboxed environment")
     def execute_code(
@@ -69,7 +78,14 @@ class AgentTools(FunctionContext):
     ) -> str:
         library_list = libraries.split(",") if libraries else None
         logger.info(f"Executing {lang} code (libraries: {library_list}): {code}")
-        return run_code(lang, code, library_list)
+        result = run_code_streaming(lang, code, library_list, self._execution_limits)
+        if result.status != COMPLETED:
+            note = f"execution stopped: {result.status}"
+        elif result.exit_code:
+            note = f"exited with code {result.exit_code}"
+        else:
+            note = ""
+        return self._formatter.format_output("execute_code", result.stdout, result.stderr, note)
 
     @ai_callable(description="Search the database for a given english query")
     def search_database(self,
@@ -78,4 +94,4 @@ class AgentTools(FunctionContext):
                         ],
                         ) -> str:
         result = self._db_query.execute_sql_query(query)
-        return str(result)
+        return self._formatter.format_response("search_database", result)
@@ -0,0 +1,207 @@
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("result_formatter")
+
+# Rough characters-per-token ratio for English text with the GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens the given text will consume."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ToolResultFormatter:
+    """
+    Shapes tool results into compact text that fits a per-tool token budget
+    before it is returned to the LLM.
+    """
+
+    def __init__(self,
+                 default_budget: int,
+                 budgets: Optional[Dict[str, int]] = None,
+                 similarity_threshold: float = 0.85) -> None:
+        """
+        Initialize the ToolResultFormatter instance.
+
+        :param default_budget: The token budget for tools without a specific budget.
+        :param budgets: Optional token budgets keyed by tool name.
+        :param similarity_threshold: Title similarity above which two articles are treated as duplicates.
+        """
+        self._default_budget = default_budget
+        self._budgets = budgets or {}
+        self._similarity_threshold = similarity_threshold
+
+    def budget(self, tool: str) -> int:
+        """Get the token budget for the given tool."""
+        return self._budgets.get(tool, self._default_budget)
+
+    def format_articles(self, tool: str, query: str, articles: List[Dict[str, Any]]) -> str:
+        """
+        Format news articles as compact lines, dropping near-duplicates and
+        any articles that do not fit the tool budget.
+
+        :param tool: The name of the tool that produced the articles.
+        :param query: The query used to search for the articles.
+        :param articles: The raw articles returned by the search.
+        :return: The formatted articles.
+        """
+        raw_tokens = estimate_tokens(self._unshaped_articles(query, articles))
+        budget = self.budget(tool)
+
+        # Keep the header to half the budget so there is always room for article content
+        instructions = "Summarize conversationally for voice; do not list articles."
+        if estimate_tokens(instructions) > budget // 4:
+            instructions = ""
+        query = self._truncate(query, budget // 2 - estimate_tokens(instructions) - 4)
+        header = f"News for '{query}'. {instructions}".rstrip()
+        if not articles:
+            return self._record(tool, raw_tokens, f"{header}\nNo news articles found.")
+
+        lines = [header]
+        used = estimate_tokens(header)
+        for article in self._deduplicate(articles):
+            line = self._format_article(article)
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                # Always keep a trimmed copy of the top article so the LLM has something to summarize
+                if len(lines) == 1:
+                    lines.append(self._truncate(line, budget - used - 1))
+                break
+            lines.append(line)
+            used += cost
+
+        return self._record(tool, raw_tokens, "\n".join(lines))
+
+    def format_response(self, tool: str, response: Any) -> str:
+        """
+        Format a query engine response, keeping only the answer text and
+        trimming it to whole sentences within the tool budget.
+
+        :param tool: The name of the tool that produced the response.
+        :param response: The query engine response.
+        :return: The formatted response.
+        """
+        raw = str(response)
+        text = getattr(response, "response", None)
+        text = self._normalize(str(text) if text is not None else raw)
+        return self._record(tool, estimate_tokens(raw), self._truncate_sentences(text, self.budget(tool)))
+
+    def format_output(self, tool: str, output: str, errors: str = "", note: str = "") -> str:
+        """
+        Format program output, keeping the head and the tail of stdout and
+        stderr when they exceed the tool budget since errors and final results
+        tend to appear last. Stderr is given up to half of the budget so it
+        always remains visible.
+
+        :param tool: The name of the tool that produced the output.
+        :param output: The program output.
+        :param errors: The program error output.
+        :param note: An optional note appended to the result, e.g. why execution stopped.
+        :return: The formatted output.
+        """
+        output, errors = output.strip(), errors.strip()
+        label = "\nstderr:\n" if errors else ""
+        note = f"\n[{note}]" if note else ""
+        available = max(self.budget(tool) * CHARS_PER_TOKEN - len(label) - len(note), 0)
+        errors_chars = min(len(errors), available // 2)
+        output_chars = min(len(output), available - errors_chars)
+        errors_chars = min(len(errors), available - output_chars)
+
+        text = self._head_tail(output, output_chars) + label + self._head_tail(errors, errors_chars) + note
+        return self._record(tool, estimate_tokens(output + errors), text)
+
+    def _deduplicate(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove articles whose titles are nearly identical to an earlier article."""
+        unique: List[Dict[str, Any]] = []
+        seen: List[str] = []
+        for article in articles:
+            title = self._normalize(article.get("name", "")).lower()
+            if title and any(SequenceMatcher(None, title, other).ratio() >= self._similarity_threshold for other in seen):
+                logger.debug(f"dropping duplicate article: {title}")
+                continue
+            if title:
+                seen.append(title)
+            unique.append(article)
+        return unique
+
+    def _format_article(self, article: Dict[str, Any]) -> str:
+        """Format the relevant fields of an article as a single line."""
+        title = self._normalize(article.get("name", "No title"))
+        description = self._normalize(article.get("description", ""))
+        providers = ", ".join(p.get("name", "") for p in article.get("provider", []) if p.get("name"))
+        published = (article.get("datePublished") or "")[:10]
+        meta = "; ".join(part for part in (providers, published) if part)
+        summary = f"- {title} ({meta})" if meta else f"- {title}"
+        return f"{summary}: {description}" if description else summary
+
+    def _record(self, tool: str, raw_tokens: int, text: str) -> str:
+        """Log the prompt tokens saved by formatting and return the formatted text."""
+        tokens = estimate_tokens(text)
+        logger.info(f"{tool} result: {tokens} tokens (saved {max(raw_tokens - tokens, 0)} of {raw_tokens})")
+        return text
+
+    @staticmethod
+    def _unshaped_articles(query: str, articles: List[Dict[str, Any]]) -> str:
+        """Format articles the way they were sent to the LLM before results were shaped."""
+        text = (
+            "INSTRUCTIONS:\n"
+            "The following content contains news articles retrieved based on the query: "
+            f"'{query}'. Each article contains a title, a brief description, "
+            "the provider (source of the article), and the date it was published. "
+            "Summarize the key points in a conversational, voice-friendly manner. "
+            "Avoid listing the articles; instead, provide a concise, natural-sounding summary "
+            "that highlights the most relevant information based on the query."
+        )
+        if not articles:
+            return text + "No news articles found for the query."
+        for article in articles:
+            providers = ", ".join(p.get("name", "Unknown provider") for p in article.get("provider", []))
+            text += (
+                f"Article:\n"
+                f"Title: {article.get('name', 'No title')}\n"
+                f"Description: {article.get('description', 'No description available')}\n"
+                f"Provider(s): {providers}\n"
+                f"Published on: {article.get('datePublished', None)}\n\n"
+            )
+        return text
+
+    @staticmethod
+    def _head_tail(text: str, max_chars: int) -> str:
+        """Shorten text to its head and tail, including the omission marker in max_chars."""
+        if len(text) <= max_chars:
+            return text
+        marker = f"\n... [{len(text)} characters, middle omitted] ...\n"
+        if max_chars <= len(marker):
+            return text[:max_chars]
+        kept = max_chars - len(marker)
+        head = kept // 3
+        return f"{text[:head]}{marker}{text[len(text) - (kept - head):]}"
+
+    @staticmethod
+    def _truncate(text: str, budget: int) -> str:
+        """Truncate text to fit within the budget, marking the cut with an ellipsis."""
+        max_chars = max(budget, 1) * CHARS_PER_TOKEN
+        return text if len(text) <= max_chars else text[:max_chars - 3].rstrip() + "..."
+
+    @staticmethod
+    def _truncate_sentences(text: str, budget: int) -> str:
+        """Truncate text to the whole sentences that fit within the budget."""
+        if estimate_tokens(text) <= budget:
+            return text
+        max_chars = budget * CHARS_PER_TOKEN
+        result = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", text):
+            candidate = f"{result} {sentence}" if result else sentence
+            if len(candidate) > max_chars:
+                break
+            result = candidate
+        return result or ToolResultFormatter._truncate(text, budget)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Collapse whitespace in the given text."""
+        return " ".join(text.split())
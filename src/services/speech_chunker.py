@@ -0,0 +1,267 @@
+import re
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from livekit.agents import tokenize, utils
+
+from config import Config
+
+# Multilingual voices detect the spoken language from each request, so they
+# need more context after a boundary than single language voices.
+VOICE_LOOKAHEAD_CHARS = {
+    "Multilingual": 24,
+}
+
+# Abbreviations that end with a period but do not end a clause
+ABBREVIATIONS = {"dr", "e.g", "etc", "i.e", "jr", "mr", "mrs", "ms", "prof", "sr", "vs"}
+
+_BOUNDARY = re.compile(r"(?:[.!?;:]+|,)[\"')\]]*(?=\s)|\n")
+_STRONG_BOUNDARY = re.compile(r"[.!?;:\n]")
+
+_FENCE = "```"
+_FENCED_CODE = re.compile(r"^[ \t]*```.*?(?:^[ \t]*```[^\n]*$|\Z)", re.M | re.S)
+_LIST_MARKER = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s*")
+
+_SPEECH_REPLACEMENTS = [
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),  # links and images
+    (re.compile(r"(\*\*|__|~~)(?=\S)(.+?)(?<=\S)\1"), r"\2"),  # bold and strikethrough
+    (re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])"), r"\1"),  # italics, not "3*4*5"
+    (re.compile(r"`+"), ""),  # inline code
+    (re.compile(r"(?<=\d),(?=\d{3}\b)"), ""),  # thousands separators
+    (re.compile(r"(\d)\s?%"), r"\1 percent"),
+    (re.compile(r"(\d)\s?–\s?(\d)"), r"\1 to \2"),
+    (re.compile(r"\s&\s"), " and "),
+    (re.compile(r"\be\.g\.", re.I), "for example"),
+    (re.compile(r"\bi\.e\.", re.I), "that is"),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"(?:\s*,)+"), ","),  # repeated separators
+    (re.compile(r"^[\s,]+|,(?=\s*[.!?;:]|\s*$)"), ""),  # empty separators
+]
+
+
+def _join_lines(text: str) -> str:
+    """
+    Join lines into spoken text. Consecutive list items are separated by
+    commas, while paragraph breaks and the end of a list end the sentence.
+    """
+    result = ""
+    previous_is_item = False
+    blank_line = False
+    for line in text.split("\n"):
+        if not line.strip():
+            blank_line = bool(result)
+            continue
+        is_item = _LIST_MARKER.match(line) is not None
+        line = _LIST_MARKER.sub("", _HEADING.sub("", line)).strip()
+        if result and not result.endswith((".", "!", "?", ",", ";", ":")):
+            result += "," if previous_is_item and is_item and not blank_line else "."
+        result = f"{result} {line}" if result else line
+        previous_is_item = is_item
+        blank_line = False
+    return result
+
+
+def normalize_for_speech(text: str) -> str:
+    """Remove markdown and rewrite numbers and symbols so they are spoken naturally."""
+    text = _join_lines(_FENCED_CODE.sub("", text))
+    for pattern, replacement in _SPEECH_REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+@dataclass(frozen=True)
+class ChunkerOptions:
+    """Options controlling how LLM text is split into chunks for TTS."""
+    first_chunk_min_chars: int = 20
+    min_chunk_chars: int = 40
+    growth_factor: float = 1.5
+    max_chunk_chars: int = 240
+    lookahead_chars: int = 8
+    normalize: bool = True
+
+    @staticmethod
+    def from_config() -> "ChunkerOptions":
+        """Create the chunker options from configuration, using the lookahead for the configured voice."""
+        return ChunkerOptions(
+            first_chunk_min_chars=Config.TTS_FIRST_CHUNK_MIN_CHARS,
+            min_chunk_chars=Config.TTS_MIN_CHUNK_CHARS,
+            growth_factor=Config.TTS_CHUNK_GROWTH,
+            max_chunk_chars=Config.TTS_MAX_CHUNK_CHARS,
+            lookahead_chars=Config.TTS_LOOKAHEAD_CHARS
+        ).for_voice(Config.TTS_VOICE)
+
+    def for_voice(self, voice: Optional[str]) -> "ChunkerOptions":
+        """Get the options with the lookahead configured for the given voice."""
+        for name, lookahead_chars in VOICE_LOOKAHEAD_CHARS.items():
+            if voice and name in voice:
+                return replace(self, lookahead_chars=max(self.lookahead_chars, lookahead_chars))
+        return self
+
+
+class _ChunkSplitter:
+    """
+    Splits streamed text at clause boundaries. The first chunk of a segment is
+    flushed at the first clause boundary past a small minimum length so audio
+    starts early, and later chunks grow to keep sentences whole. Fenced code
+    blocks are dropped line by line before the text is split.
+    """
+
+    def __init__(self, options: ChunkerOptions) -> None:
+        self._options = options
+        self._buffer = ""
+        self._line = ""
+        self._line_is_text = False
+        self._in_fence = False
+        self._min_chars = options.first_chunk_min_chars
+        self._is_first = True
+
+    def push(self, text: str) -> List[str]:
+        """Add text and return any chunks that are ready."""
+        self._buffer += self._filter_fences(text)
+        chunks = []
+        while (end := self._next_boundary()) is not None:
+            chunks.extend(self._emit(self._buffer[:end]))
+            self._buffer = self._buffer[end:].lstrip()
+        return chunks
+
+    def finish(self) -> List[str]:
+        """Return the remaining text and start a new segment."""
+        if not self._in_fence and not self._line.lstrip().startswith(_FENCE):
+            self._buffer += self._line
+        chunks = self._emit(self._buffer)
+        self._buffer = ""
+        self._line = ""
+        self._line_is_text = False
+        self._in_fence = False
+        self._min_chars = self._options.first_chunk_min_chars
+        self._is_first = True
+        return chunks
+
+    def _filter_fences(self, text: str) -> str:
+        """
+        Remove fenced code blocks from streamed text. Lines that might open or
+        close a fence are held back until they are complete; any other text is
+        passed through as soon as it arrives.
+        """
+        result = ""
+        for piece in re.split(r"(?<=\n)", text):
+            self._line += piece
+            if self._line_is_text:
+                result += self._line
+            elif self._line.endswith("\n"):
+                stripped = self._line.strip()
+                if stripped.startswith(_FENCE):
+                    # A fence line opens or closes a block, unless it also closes itself
+                    if _FENCE not in stripped[len(_FENCE):]:
+                        self._in_fence = not self._in_fence
+                elif not self._in_fence:
+                    result += self._line
+            elif not self._in_fence and not _FENCE.startswith(self._line.lstrip()[:len(_FENCE)]):
+                self._line_is_text = True
+                result += self._line
+
+            if self._line_is_text or self._line.endswith("\n"):
+                self._line_is_text = self._line_is_text and not self._line.endswith("\n")
+                self._line = ""
+        return result
+
+    def _next_boundary(self) -> Optional[int]:
+        """Find the end of the next chunk in the buffer, if there is one."""
+        options = self._options
+        limit = len(self._buffer) - options.lookahead_chars
+        strong = weak = None
+        for match in _BOUNDARY.finditer(self._buffer):
+            end = match.end()
+            if end > limit:
+                break
+            if self._is_false_boundary(match.start()):
+                continue
+            is_strong = _STRONG_BOUNDARY.match(match.group()) is not None
+            if self._min_chars <= end <= options.max_chunk_chars and (self._is_first or is_strong):
+                return end
+            if end <= options.max_chunk_chars:
+                strong, weak = (end, weak) if is_strong else (strong, end)
+
+        if len(self._buffer) > options.max_chunk_chars:
+            # Fall back to the last sentence or clause that fits, then to the last whole word
+            word = self._buffer.rfind(" ", 0, options.max_chunk_chars) + 1
+            return strong or weak or word or options.max_chunk_chars
+        return None
+
+    def _is_false_boundary(self, index: int) -> bool:
+        """Check whether the period at the given index ends an abbreviation or a list number."""
+        if self._buffer[index] != ".":
+            return False
+        start = max(self._buffer.rfind(" ", 0, index), self._buffer.rfind("\n", 0, index)) + 1
+        word = self._buffer[start:index].lower()
+        if word.isdigit():
+            return start == 0 or self._buffer[start - 1] == "\n"
+        if word == "no":
+            # "No. 5" is an abbreviation, but "the answer is no." ends a sentence
+            return re.match(r"\.\s+\d", self._buffer[index:]) is not None
+        return word in ABBREVIATIONS or bool(re.fullmatch(r"(?:[a-z]\.)+[a-z]", word))
+
+    def _emit(self, text: str) -> List[str]:
+        """Normalize a chunk and advance the chunk size."""
+        chunk = normalize_for_speech(text) if self._options.normalize else text.strip()
+        if not chunk:
+            return []
+        if self._is_first:
+            self._is_first = False
+            self._min_chars = self._options.min_chunk_chars
+        else:
+            self._min_chars = min(int(self._min_chars * self._options.growth_factor), self._options.max_chunk_chars)
+        return [chunk]
+
+
+class SpeechChunkStream(tokenize.SentenceStream):
+    """Sentence stream that emits speech chunks as LLM text is pushed."""
+
+    def __init__(self, options: ChunkerOptions) -> None:
+        super().__init__()
+        self._splitter = _ChunkSplitter(options)
+        self._segment_id = utils.shortuuid()
+
+    def push_text(self, text: str) -> None:
+        self._check_not_closed()
+        self._send(self._splitter.push(text))
+
+    def flush(self) -> None:
+        self._check_not_closed()
+        self._send(self._splitter.finish())
+        self._segment_id = utils.shortuuid()
+
+    def end_input(self) -> None:
+        self.flush()
+        self._do_close()
+
+    async def aclose(self) -> None:
+        self._do_close()
+
+    def _send(self, chunks: List[str]) -> None:
+        for chunk in chunks:
+            self._event_ch.send_nowait(tokenize.TokenData(segment_id=self._segment_id, token=chunk))
+
+
+class SpeechChunker(tokenize.SentenceTokenizer):
+    """
+    Sentence tokenizer used between the LLM and a non-streaming TTS to start
+    speaking at the first clause and then grow chunks for natural prosody.
+    """
+
+    def __init__(self, options: ChunkerOptions = ChunkerOptions()) -> None:
+        """Initialize the SpeechChunker instance."""
+        self._options = options
+
+    @property
+    def options(self) -> ChunkerOptions:
+        """Get the chunker options."""
+        return self._options
+
+    def tokenize(self, text: str, *, language: Optional[str] = None) -> List[str]:
+        splitter = _ChunkSplitter(self._options)
+        return splitter.push(text) + splitter.finish()
+
+    def stream(self, *, language: Optional[str] = None) -> SpeechChunkStream:
+        return SpeechChunkStream(self._options)
@@ -1,9 +1,10 @@
 from livekit.agents.llm import LLM
 from livekit.agents.stt import STT
-from livekit.agents.tts import TTS
+from livekit.agents.tts import TTS, StreamAdapter
 from livekit.plugins import azure, deepgram, openai, silero
 
 from config import Config
+from services.speech_chunker import ChunkerOptions, SpeechChunker
 
 
 class VoiceServices:
@@ -67,10 +68,14 @@ class VoiceServices:
         #     speech_region=Config.AZURE_SPEECH_REGION
         # )
 
-        tts = azure.TTS(
-            voice = Config.TTS_VOICE,
-            speech_key = Config.AZURE_SPEECH_KEY,
-            speech_region = Config.AZURE_SPEECH_REGION
+        # Feed LLM text to the non-streaming Azure TTS in growing chunks to start speaking early
+        tts = StreamAdapter(
+            tts = azure.TTS(
+                voice = Config.TTS_VOICE,
+                speech_key = Config.AZURE_SPEECH_KEY,
+                speech_region = Config.AZURE_SPEECH_REGION
+            ),
+            sentence_tokenizer = SpeechChunker(ChunkerOptions.from_config())
         )
 
         vad = silero.VAD.load()
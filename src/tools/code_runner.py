@@ -1,23 +1,209 @@
 import logging
-from typing import List, Optional
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 from llm_sandbox import SandboxSession
+from llm_sandbox.const import NotSupportedLibraryInstallation, SupportedLanguage
+from llm_sandbox.utils import get_code_execution_command, get_code_file_extension, get_libraries_installation_command
 
 logger = logging.getLogger("code_runner")
 
+COMPLETED = "completed"
 
-def run_code(lang: str, code: str, libraries: Optional[List] = None) -> str:
+# Completed runs are cached for identical inputs for a limited time
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 32
+
+
+@dataclass(frozen=True)
+class ExecutionLimits:
+    """Resource limits applied to a sandboxed code execution."""
+    timeout_seconds: float = 30.0
+    cpu_seconds: int = 20
+    memory_limit: str = "256m"
+    max_output_bytes: int = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ExecutionResult:
+    """The captured output of a sandboxed code execution."""
+    stdout: str
+    stderr: str
+    status: str
+    exit_code: int = 0
+
+
+_CacheKey = Tuple[str, str, Tuple[str, ...], ExecutionLimits]
+_cache: Dict[_CacheKey, Tuple[float, ExecutionResult]] = {}
+_cache_lock = threading.Lock()
+
+
+def run_code_streaming(lang: str,
+                       code: str,
+                       libraries: Optional[List] = None,
+                       limits: ExecutionLimits = ExecutionLimits()) -> ExecutionResult:
     """
-        Run code in a sandboxed environment.
+        Run code in a sandboxed environment, streaming its output and enforcing resource limits.
+        Completed runs are cached for identical inputs.
         :param lang: The language of the code.
         :param code: The code to run.
         :param libraries: The libraries to use, it is optional.
-        :return: The output of the code.
+        :param limits: The resource and output limits to apply.
+        :return: The captured output of the code, up to the output limit.
         """
-    logger.info(f"Running {lang} code:")
+    key = (lang, code, tuple(libraries or ()), limits)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+            logger.info(f"Using cached result for {lang} code")
+            return cached[1]
+
+    result = _run_code(lang, code, key[2], limits)
+    if result.status == COMPLETED and result.exit_code == 0:
+        with _cache_lock:
+            now = time.monotonic()
+            for expired in [k for k, (created, _) in _cache.items() if now - created >= CACHE_TTL_SECONDS]:
+                del _cache[expired]
+            while len(_cache) >= CACHE_MAX_ENTRIES:
+                del _cache[next(iter(_cache))]
+            _cache[key] = (now, result)
+    return result
+
+
+def _run_code(lang: str, code: str, libraries: Tuple[str, ...], limits: ExecutionLimits) -> ExecutionResult:
+    """Run code with the given limits."""
+    if libraries and lang.upper() in NotSupportedLibraryInstallation:
+        raise ValueError(f"Library installation has not been supported for {lang} yet!")
+
+    logger.info(f"Running {lang} code (limits: {limits}):")
     for line in code.split('\n'):
         if line:
             logger.info(f"\t{line}")
 
-    with SandboxSession(lang=lang, verbose=True) as session:  # type: ignore[attr-defined]
-        return session.run(code, libraries).text
+    # A single wall-clock deadline covers library installation and every execution command
+    deadline = time.monotonic() + limits.timeout_seconds
+    container_configs = {"mem_limit": limits.memory_limit, "memswap_limit": limits.memory_limit}
+    with SandboxSession(lang=lang, container_configs=container_configs) as session:  # type: ignore[attr-defined]
+        workdir = "/example" if lang == SupportedLanguage.GO else None
+        if libraries:
+            result = _install_libraries(session.container, lang, libraries, deadline, limits)
+            if result is not None:
+                return result
+
+        with tempfile.TemporaryDirectory() as directory_name:
+            extension = get_code_file_extension(lang)
+            code_file = os.path.join(directory_name, f"code.{extension}")
+            with open(code_file, "w") as f:
+                f.write(code)
+            code_dest_file = f"{workdir or '/tmp'}/code.{extension}"
+            session.copy_to_runtime(code_file, code_dest_file)
+
+        stdout = bytearray()
+        stderr = bytearray()
+        status, exit_code = COMPLETED, 0
+        for command in get_code_execution_command(lang, code_dest_file):
+            status, exit_code = _stream_command(session.container, command, workdir, deadline, limits, stdout, stderr)
+            if status != COMPLETED or exit_code:
+                break
+
+    logger.info(f"Execution {status} with exit code {exit_code} "
+                f"({len(stdout)} stdout bytes, {len(stderr)} stderr bytes)")
+    return ExecutionResult(stdout=stdout.decode("utf-8", errors="replace"),
+                           stderr=stderr.decode("utf-8", errors="replace"),
+                           status=status,
+                           exit_code=exit_code)
+
+
+def _install_libraries(container,
+                       lang: str,
+                       libraries: Tuple[str, ...],
+                       deadline: float,
+                       limits: ExecutionLimits) -> Optional[ExecutionResult]:
+    """
+    Install the libraries required by the code, mirroring SandboxSession.run
+    but within the execution deadline.
+
+    :return: The result of an installation command that was stopped, or None otherwise.
+    """
+    workdir = "/example" if lang == SupportedLanguage.GO else None
+    commands: List[Tuple[str, Optional[str]]] = []
+    if lang == SupportedLanguage.GO:
+        commands += [("mkdir -p /example", None), ("go mod init example", workdir), ("go mod tidy", workdir)]
+    commands += [(get_libraries_installation_command(lang, library), workdir) for library in libraries]
+
+    for command, command_workdir in commands:
+        # Installation output is only kept to report failures and never stops the command
+        output = bytearray()
+        status, exit_code = _stream_command(container, command, command_workdir, deadline, limits, output, output,
+                                            stop_at_limit=False)
+        if status != COMPLETED:
+            logger.info(f"Library installation {status}: {command}")
+            return ExecutionResult(stdout="",
+                                   stderr=f"{command}\n{output.decode('utf-8', errors='replace')}",
+                                   status=f"{status} during library installation")
+        if exit_code:
+            # Like SandboxSession.run, a failed installation is left for the code itself to report
+            logger.warning(f"Library installation exited with code {exit_code}: {command}\n"
+                           f"{output.decode('utf-8', errors='replace')}")
+    return None
+
+
+def _stream_command(container,
+                    command: str,
+                    workdir: Optional[str],
+                    deadline: float,
+                    limits: ExecutionLimits,
+                    stdout: bytearray,
+                    stderr: bytearray,
+                    stop_at_limit: bool = True) -> Tuple[str, int]:
+    """
+    Run a command in the container, streaming its output into the buffers.
+    The container is killed when the deadline passes or, if stop_at_limit is
+    set, once the output budget is exceeded. Output beyond the budget is dropped.
+
+    :return: The execution status and the exit code of the command.
+    """
+    api = container.client.api
+    cmd = ["sh", "-c", f"ulimit -t {limits.cpu_seconds}; exec {command}"]
+    exec_id = api.exec_create(container.id, cmd, workdir=workdir)["Id"]
+    exceeded = threading.Event()
+    killed = threading.Event()
+
+    def read() -> None:
+        try:
+            for out, err in api.exec_start(exec_id, stream=True, demux=True):
+                remaining = max(limits.max_output_bytes - len(stdout) - len(stderr), 0)
+                stdout.extend((out or b"")[:remaining])
+                remaining -= min(len(out or b""), remaining)
+                stderr.extend((err or b"")[:remaining])
+                if stop_at_limit and len(stdout) + len(stderr) >= limits.max_output_bytes:
+                    exceeded.set()
+                    return
+        except Exception as e:
+            if killed.is_set():
+                logger.debug(f"Output stream closed after kill: {e}")
+            else:
+                logger.warning(f"Failed to read output stream: {e}")
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    reader.join(max(deadline - time.monotonic(), 0.0))
+
+    if reader.is_alive() or exceeded.is_set():
+        status = "output limit reached" if exceeded.is_set() else f"timed out after {limits.timeout_seconds}s"
+        killed.set()
+        container.kill()
+        reader.join(1.0)
+        return status, 0
+
+    exit_code = api.exec_inspect(exec_id).get("ExitCode") or 0
+    # 137 and 152 are SIGKILL (out of memory) and SIGXCPU (cpu limit)
+    if exit_code == 137:
+        return "killed, memory limit exceeded", exit_code
+    if exit_code == 152:
+        return "cpu time limit exceeded", exit_code
+    return COMPLETED, exit_code